@@ -1,41 +1,117 @@
 #!/usr/bin/env python3
-"""Build a markdown digest from a JSON list of papers.
-
-Input JSON schema (list):
-[
-  {
-    "title": "...",
-    "authors": ["A", "B"],
-    "url": "https://...",
-    "venue": "arXiv",
-    "date": "2026-02-28",
-    "summary": "...",
-    "contribution": "...",
-    "evidence": "...",
-    "takeaway": "...",
-    "caveat": "..."
-  }
-]
+"""Build a markdown digest (plus optional CSV/HTML) from paper records.
+
+Input is one or more paths or globs. ``*.jsonl`` / ``*.ndjson`` files hold one
+paper object per line; any other file must be a JSON list of paper objects
+(e.g. the ``daily-report-YYYY-MM-DD.json`` files written by run_today_push.py).
+
+Paper object schema:
+{
+  "title": "...",
+  "authors": ["A", "B"],
+  "url": "https://...",
+  "venue": "arXiv",
+  "date": "2026-02-28",            # "published" is accepted as a fallback
+  "summary": "...",
+  "contribution": "...",
+  "evidence": "...",
+  "takeaway": "...",
+  "caveat": "..."
+}
+
+Records are streamed: each paper is rendered as soon as it is read, so weekly or
+monthly digests over many files run in constant memory (a single JSON-list file
+is still loaded whole; use JSON Lines for very large inputs).
 """
 
 from __future__ import annotations
 
 import argparse
+import csv
+import glob
+import html
+import io
 import json
+import math
+import re
+import shutil
+import tempfile
+from collections import Counter
 from pathlib import Path
+from typing import IO, Iterable, Iterator
 
+CSV_FIELDS = ["index", "title", "authors", "url", "venue", "date", "summary", "contribution", "evidence", "takeaway", "caveat"]
 
-def format_paper(i: int, p: dict) -> str:
+STOPWORDS = {
+    "about", "above", "across", "after", "also", "among", "based", "been", "being", "between", "both", "can", "could",
+    "does", "during", "each", "from", "further", "have", "here", "however", "into", "more", "most", "much", "only",
+    "other", "over", "paper", "papers", "present", "results", "show", "shows", "such", "than", "that", "their",
+    "them", "then", "there", "these", "they", "this", "those", "through", "under", "using", "very", "well", "were",
+    "what", "when", "where", "which", "while", "with", "within", "without", "would", "study", "work", "approach",
+    "method", "methods", "propose", "proposed", "demonstrate", "new", "novel", "available", "abstract",
+}
+
+# Cap on distinct terms kept while counting; the long tail is pruned so memory stays bounded.
+MAX_TRACKED_TERMS = 50000
+# A trend must appear in at least this share of papers (and in at least 2 papers).
+MIN_TREND_SHARE = 0.02
+
+
+def expand_inputs(patterns: Iterable[str]) -> list[Path]:
+    paths: list[Path] = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for m in matches:
+            path = Path(m)
+            if path not in paths:
+                paths.append(path)
+    if not paths:
+        raise ValueError(f"No input files matched: {', '.join(patterns)}")
+    return paths
+
+
+def iter_records(paths: Iterable[Path]) -> Iterator[dict]:
+    for path in paths:
+        if path.suffix.lower() in (".jsonl", ".ndjson"):
+            with path.open(encoding="utf-8") as fh:
+                for line_no, line in enumerate(fh, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    rec = json.loads(line)
+                    if not isinstance(rec, dict):
+                        raise ValueError(f"{path}:{line_no}: expected a paper object")
+                    yield rec
+        else:
+            papers = json.loads(path.read_text(encoding="utf-8"))
+            if not isinstance(papers, list):
+                raise ValueError(f"{path}: input JSON must be a list of paper objects")
+            for i, rec in enumerate(papers):
+                if not isinstance(rec, dict):
+                    raise ValueError(f"{path}: item {i} is not a paper object")
+                yield rec
+
+
+def _authors(p: dict, sep: str = ", ") -> str:
     authors = p.get("authors", [])
     if isinstance(authors, list):
-        authors = ", ".join(authors)
+        return sep.join(str(a) for a in authors)
+    return str(authors or "")
+
+
+def _date(p: dict) -> str:
+    return p.get("date") or p.get("published") or ""
+
+
+def format_paper(i: int, p: dict) -> str:
+    authors = _authors(p)
 
     return f"""### Paper {i}
 - Title: {p.get('title', 'N/A')}
 - Authors: {authors or 'N/A'}
 - Source URL: {p.get('url', 'N/A')}
 - Venue / Status: {p.get('venue', 'N/A')}
-- Published / Submitted: {p.get('date', 'N/A')}
+- Published / Submitted: {_date(p) or 'N/A'}
 - Summary: {p.get('summary', 'N/A')}
 - Key contribution: {p.get('contribution', 'N/A')}
 - Evidence snapshot: {p.get('evidence', 'N/A')}
@@ -44,48 +120,196 @@ def format_paper(i: int, p: dict) -> str:
 """
 
 
-def build(topic: str, window: str, sources: str, papers: list[dict]) -> str:
-    header = f"""# Daily Frontier Papers Report (English)
+def format_paper_html(i: int, p: dict) -> str:
+    e = lambda v: html.escape(str(v))  # noqa: E731
+    url = p.get("url", "")
+    link = f'<a href="{e(url)}">{e(url)}</a>' if url else "N/A"
+    return f"""<section class="paper">
+<h3>Paper {i}</h3>
+<ul>
+<li>Title: {e(p.get('title', 'N/A'))}</li>
+<li>Authors: {e(_authors(p) or 'N/A')}</li>
+<li>Source URL: {link}</li>
+<li>Venue / Status: {e(p.get('venue', 'N/A'))}</li>
+<li>Published / Submitted: {e(_date(p) or 'N/A')}</li>
+<li>Summary: {e(p.get('summary', 'N/A'))}</li>
+<li>Key contribution: {e(p.get('contribution', 'N/A'))}</li>
+<li>Evidence snapshot: {e(p.get('evidence', 'N/A'))}</li>
+<li>Practical takeaway: {e(p.get('takeaway', 'N/A'))}</li>
+<li>Caveat: {e(p.get('caveat', 'N/A'))}</li>
+</ul>
+</section>
+"""
+
+
+def paper_terms(p: dict) -> set[str]:
+    """Distinct unigrams and bigrams from title + summary, minus stopwords."""
+    text = f"{p.get('title', '')}. {p.get('summary', '')}".lower()
+    terms: set[str] = set()
+    # Bigrams never span punctuation, so phrases stay within one clause.
+    for clause in re.split(r"[.,;:!?()\[\]<>]", text):
+        words = re.findall(r"[a-z][a-z0-9\-]+", clause)
+        terms.update(w for w in words if len(w) >= 4 and w not in STOPWORDS)
+        for a, b in zip(words, words[1:]):
+            if a not in STOPWORDS and b not in STOPWORDS and len(a) >= 3 and len(b) >= 3:
+                terms.add(f"{a} {b}")
+    return terms
+
+
+class TermStats:
+    """Per-term paper counts with bounded memory.
+
+    When the long tail is pruned, the largest discarded count becomes ``error``:
+    a kept count is then a lower bound and the true count is at most ``count + error``.
+    """
+
+    def __init__(self, max_terms: int = MAX_TRACKED_TERMS) -> None:
+        self.counts: Counter = Counter()
+        self.error = 0
+        self.max_terms = max_terms
+
+    def add(self, p: dict) -> None:
+        self.counts.update(paper_terms(p))
+        if len(self.counts) > self.max_terms:
+            ranked = self.counts.most_common()
+            keep = self.max_terms // 2
+            self.error = max(self.error, ranked[keep][1])
+            self.counts = Counter(dict(ranked[:keep]))
+
+    def top_trends(self, n_papers: int, limit: int = 5) -> list[tuple[str, int]]:
+        """Most frequent terms by paper count, skipping words already covered by a chosen phrase."""
+        min_df = max(2, math.ceil(MIN_TREND_SHARE * n_papers)) if n_papers > 1 else 1
+        chosen: list[tuple[str, int]] = []
+        # Prefer phrases over single words at equal frequency.
+        for term, df in sorted(self.counts.items(), key=lambda kv: (-kv[1], -kv[0].count(" "), kv[0])):
+            if df < min_df or len(chosen) >= limit:
+                break
+            if any(set(term.split()) & set(c.split()) for c, _ in chosen):
+                continue
+            chosen.append((term, df))
+        return chosen
+
+    def trend_lines(self, trends: list[tuple[str, int]], n_papers: int) -> list[str]:
+        if not trends:
+            return ["No recurring terms across the selected papers."]
+        # After pruning, counts are lower bounds.
+        approx = "≥" if self.error else ""
+        return [f"{term}: appears in {approx}{df} of {n_papers} papers ({approx}{100 * df / n_papers:.0f}%)" for term, df in trends]
+
+
+def render(
+    topic: str,
+    window: str,
+    sources: str,
+    papers: Iterable[dict],
+    md_out: IO[str],
+    csv_out: IO[str] | None = None,
+    html_out: IO[str] | None = None,
+) -> int:
+    """Stream papers into the markdown (and optional CSV/HTML) outputs; return the paper count.
+
+    Paper sections are spooled to temporary files because the header carries the
+    selection size and the footer the trends, both known only after the last record.
+    """
+    terms = TermStats()
+    n = 0
+    csv_writer = None
+    if csv_out is not None:
+        csv_writer = csv.DictWriter(csv_out, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        csv_writer.writeheader()
+
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as md_body, tempfile.TemporaryFile("w+", encoding="utf-8") as html_body:
+        for p in papers:
+            n += 1
+            if n > 1:
+                md_body.write("\n")
+            md_body.write(format_paper(n, p))
+            if html_out is not None:
+                html_body.write(format_paper_html(n, p))
+            if csv_writer is not None:
+                row = {k: p.get(k, "") for k in CSV_FIELDS}
+                row.update(index=n, authors=_authors(p, "; "), date=_date(p))
+                csv_writer.writerow(row)
+            terms.add(p)
+
+        trends = terms.top_trends(n)
+        keywords = ", ".join(term for term, _ in trends[:3])
+
+        md_out.write(f"""# Daily Frontier Papers Report (English)
 
 ## 1) Scope
 - Topic: {topic}
 - Time window: {window}
 - Sources: {sources}
-- Selection size: {len(papers)}
+- Selection size: {n}
 
 ## 2) Top Papers
 
-"""
-    body = "\n".join(format_paper(i + 1, p) for i, p in enumerate(papers))
-    footer = """
-## 3) Cross-paper Trends (3-5 bullets)
-- 
-- 
-- 
-
+""")
+        md_body.seek(0)
+        shutil.copyfileobj(md_body, md_out)
+        md_out.write("\n\n## 3) Cross-paper Trends (3-5 bullets)\n")
+        md_out.writelines(f"- {line}\n" for line in terms.trend_lines(trends, n))
+        md_out.write(f"""
 ## 4) Recommended Next Actions
 - Immediate read list:
 - Potential replication targets:
-- Monitoring keywords for tomorrow:
-"""
-    return header + body + "\n" + footer
+- Monitoring keywords for tomorrow: {keywords}
+""")
+
+        if html_out is not None:
+            e = html.escape
+            html_out.write(f"""<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>Daily Frontier Papers Report</title></head>
+<body>
+<h1>Daily Frontier Papers Report (English)</h1>
+<h2>1) Scope</h2>
+<ul>
+<li>Topic: {e(topic)}</li>
+<li>Time window: {e(window)}</li>
+<li>Sources: {e(sources)}</li>
+<li>Selection size: {n}</li>
+</ul>
+<h2>2) Top Papers</h2>
+""")
+            html_body.seek(0)
+            shutil.copyfileobj(html_body, html_out)
+            html_out.write("<h2>3) Cross-paper Trends</h2>\n<ul>\n")
+            html_out.writelines(f"<li>{e(line)}</li>\n" for line in terms.trend_lines(trends, n))
+            html_out.write("</ul>\n</body>\n</html>\n")
+
+    return n
+
+
+def build(topic: str, window: str, sources: str, papers: list[dict]) -> str:
+    buf = io.StringIO()
+    render(topic, window, sources, papers, buf)
+    return buf.getvalue()
 
 
 def main() -> None:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--input", required=True, help="Path to input JSON")
+    parser.add_argument("--input", required=True, nargs="+", help="Input JSON / JSON Lines paths or globs (e.g. 'reports/daily-report-*.json')")
     parser.add_argument("--output", required=True, help="Path to output markdown")
+    parser.add_argument("--csv", default="", help="Optional path to also write a CSV table")
+    parser.add_argument("--html", default="", help="Optional path to also write an HTML page")
     parser.add_argument("--topic", default="Unspecified topic")
     parser.add_argument("--window", default="Last 24 hours")
     parser.add_argument("--sources", default="arXiv, Papers With Code")
     args = parser.parse_args()
 
-    papers = json.loads(Path(args.input).read_text(encoding="utf-8"))
-    if not isinstance(papers, list):
-        raise ValueError("Input JSON must be a list of paper objects")
+    papers = iter_records(expand_inputs(args.input))
 
-    markdown = build(args.topic, args.window, args.sources, papers)
-    Path(args.output).write_text(markdown, encoding="utf-8")
+    with Path(args.output).open("w", encoding="utf-8") as md_out:
+        csv_out = Path(args.csv).open("w", encoding="utf-8", newline="") if args.csv else None
+        html_out = Path(args.html).open("w", encoding="utf-8") if args.html else None
+        try:
+            render(args.topic, args.window, args.sources, papers, md_out, csv_out, html_out)
+        finally:
+            for fh in (csv_out, html_out):
+                if fh is not None:
+                    fh.close()
 
 
 if __name__ == "__main__":
@@ -16,3 +16,7 @@ else
   echo "Recommendation: Run 'openclaw gateway restart'."
   echo "If unresolved, run 'openclaw gateway stop && openclaw gateway start', then re-check status."
 fi
+
+# Upstream source latency (arXiv / Crossref / OpenAlex); feeds run_today_push.py source selection.
+echo ""
+python3 "$(dirname "$0")/source_health.py" --history "$(pwd)/reports/source-health.json" || true
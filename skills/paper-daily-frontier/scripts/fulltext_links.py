@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""Full-text PDF scan for code / data / SI links and a data-availability snippet.
+
+Used by run_today_push.py as an optional stage (``--fulltext-top-n``). PDFs are
+downloaded and parsed in a process pool under a hard wall-clock budget; results
+are cached per paper ID so repeat pushes on the same day never re-download.
+
+Text extraction is stdlib-only: literal and hex strings from zlib-inflated page
+content streams, plus /URI link annotations from every stream (including object
+streams). Fonts are not decoded, so PDFs whose text uses CID/Identity-H glyph
+codes (common in Word/Acrobat-generated ChemRxiv files) yield annotation links
+only; body-text URLs and the data-availability snippet need single-byte fonts.
+
+Standalone use (e.g. against a local ``python3 -m http.server`` with sample PDFs):
+
+    python3 fulltext_links.py http://127.0.0.1:8000/sample.pdf ./other.pdf
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import re
+import time
+import urllib.request
+import zlib
+from pathlib import Path
+
+CODE_HOSTS = ["github.com", "gitlab", "bitbucket.org", "codeocean.com", "huggingface.co", "sourceforge.net", "pypi.org"]
+DATA_HOSTS = ["zenodo", "figshare", "datadryad", "materialscloud", "osf.io", "dataverse", "kaggle.com", "10.5281/", "10.6084/"]
+SI_HINTS = ["suppl", "supporting", "suppinfo", "/si/", "_si.", "-si."]
+
+AVAILABILITY_RE = re.compile(
+    r"(data\s+and\s+code\s+availability|code\s+and\s+data\s+availability|data\s+availability|"
+    r"code\s+availability|availability\s+of\s+data)",
+    re.I,
+)
+URL_RE = re.compile(r"(?:https?://|www\.|(?:github\.com|gitlab\.com|zenodo\.org)/)[^\s)\]>\"'}<]+", re.I)
+MAX_PDF_BYTES = 30 * 1024 * 1024
+
+
+def paper_id(p: dict) -> str:
+    """Stable cache key: arXiv ID (version stripped), else DOI, else URL."""
+    url = p.get("url", "") or p.get("pdf_url", "")
+    m = re.search(r"arxiv\.org/(?:abs|pdf)/([^\s?#]+?)(?:v\d+)?(?:\.pdf)?$", url)
+    if m:
+        return f"arxiv:{m.group(1)}"
+    m = re.search(r"(10\.\d{4,9}/[^\s?#]+)", url)
+    if m:
+        return f"doi:{m.group(1).lower()}"
+    return url
+
+
+def pdf_url_for(p: dict) -> str:
+    if p.get("pdf_url"):
+        return p["pdf_url"]
+    url = p.get("url", "")
+    m = re.search(r"arxiv\.org/abs/([^\s?#]+)", url)
+    if m:
+        return f"https://arxiv.org/pdf/{m.group(1)}"
+    if url.lower().endswith(".pdf"):
+        return url
+    return ""
+
+
+def _unescape_pdf_string(s: bytes) -> str:
+    out = bytearray()
+    i = 0
+    while i < len(s):
+        c = s[i]
+        if c == 0x5C and i + 1 < len(s):  # backslash
+            n = s[i + 1]
+            if 0x30 <= n <= 0x37:
+                j = i + 1
+                while j < len(s) and j < i + 4 and 0x30 <= s[j] <= 0x37:
+                    j += 1
+                out.append(int(s[i + 1 : j], 8) & 0xFF)
+                i = j
+                continue
+            out.append({ord("n"): 10, ord("r"): 13, ord("t"): 9, ord("b"): 8, ord("f"): 12}.get(n, n))
+            i += 2
+            continue
+        out.append(c)
+        i += 1
+    return out.decode("latin-1")
+
+
+_STR = rb"\((?:\\.|[^\\()])*\)"
+_HEX = rb"<[0-9A-Fa-f\s]*>"
+# Alternatives inside a TJ array must stay disjoint (strings start with "(" or "<", everything
+# else excludes those), otherwise non-TJ arrays such as /Names trees backtrack exponentially.
+_TEXT_OP_RE = re.compile(
+    rb"(" + _STR + rb"|" + _HEX + rb")\s*(?:Tj|'|\")"
+    rb"|\[((?:" + _STR + rb"|" + _HEX + rb"|[^\]()<>])*)\]\s*TJ"
+    rb"|(T\*|Td|TD|ET)(?=\s|$)",
+    re.S,
+)
+_ARRAY_ITEM_RE = re.compile(rb"(" + _STR + rb"|" + _HEX + rb")|(-?\d+(?:\.\d+)?)")
+_URI_RE = re.compile(rb"/URI\s*(" + _STR + rb")")
+_STREAM_RE = re.compile(rb"obj\s*(<<(?:(?!endobj).)*?>>)\s*stream\r?\n(.*?)\r?\n?endstream", re.S)
+# Stream dictionaries that never hold page text (object/xref streams, font programs, metadata).
+_NON_CONTENT_RE = re.compile(rb"/Type\s*/(?:ObjStm|XRef|Metadata|EmbeddedFile)|/Length[123]\b")
+_IMAGE_RE = re.compile(rb"/Subtype\s*/Image|/DCTDecode|/JPXDecode")
+
+
+def _decode_hex_string(s: bytes) -> str:
+    digits = re.sub(rb"\s+", b"", s)
+    if len(digits) % 2:
+        digits += b"0"
+    raw = bytes.fromhex(digits.decode("ascii"))
+    # Two-byte codes with zero high bytes are UTF-16BE-style text; anything else is read as single-byte.
+    if len(raw) >= 2 and len(raw) % 2 == 0 and all(b == 0 for b in raw[::2]):
+        return raw[1::2].decode("latin-1")
+    return raw.decode("latin-1")
+
+
+def _decode_string(token: bytes) -> str:
+    if token.startswith(b"<"):
+        return _decode_hex_string(token[1:-1])
+    return _unescape_pdf_string(token[1:-1])
+
+
+def _content_text(data: bytes) -> str:
+    parts: list[str] = []
+    for m in _TEXT_OP_RE.finditer(data):
+        if m.group(1):
+            parts.append(_decode_string(m.group(1)))
+        elif m.group(2) is not None:
+            for item in _ARRAY_ITEM_RE.finditer(m.group(2)):
+                if item.group(1):
+                    parts.append(_decode_string(item.group(1)))
+                elif float(item.group(2)) < -200:  # large kerning gap ~ word space
+                    parts.append(" ")
+        else:
+            parts.append("\n")
+    return "".join(parts)
+
+
+def pdf_text(data: bytes) -> tuple[str, list[str]]:
+    """Return (body text, link-annotation URIs) extracted from raw PDF bytes."""
+    chunks: list[tuple[bytes, bool]] = [(data, False)]
+    for m in _STREAM_RE.finditer(data):
+        stream_dict, raw = m.group(1), m.group(2)
+        if _IMAGE_RE.search(stream_dict):
+            continue  # images never carry links or text
+        try:
+            inflated = zlib.decompressobj().decompress(raw)
+        except zlib.error:
+            inflated = raw  # uncompressed (or unsupported filter) stream
+        chunks.append((inflated, not _NON_CONTENT_RE.search(stream_dict)))
+
+    text_parts: list[str] = []
+    uris: list[str] = []
+    for chunk, is_content in chunks:
+        for m in _URI_RE.finditer(chunk):
+            uri = _unescape_pdf_string(m.group(1)[1:-1]).strip()
+            if uri and uri not in uris:
+                uris.append(uri)
+        if is_content and b"BT" in chunk:
+            text_parts.append(_content_text(chunk))
+    return "\n".join(t for t in text_parts if t.strip()), uris
+
+
+def extract_links(text: str, uris: list[str] | None = None) -> dict:
+    found: list[str] = []
+    for u in list(uris or []) + URL_RE.findall(text):
+        u = u.rstrip(".,;:")
+        if not u.lower().startswith("http"):
+            u = "https://" + u
+        if u not in found:
+            found.append(u)
+
+    code = [u for u in found if any(h in u.lower() for h in CODE_HOSTS)]
+    data = [u for u in found if u not in code and any(h in u.lower() for h in DATA_HOSTS)]
+    si = [u for u in found if u not in code and u not in data and any(h in u.lower() for h in SI_HINTS)]
+
+    snippet = ""
+    m = AVAILABILITY_RE.search(text)
+    if m:
+        snippet = re.sub(r"\s+", " ", text[m.start() : m.start() + 400]).strip()
+        if len(snippet) > 300:
+            snippet = snippet[:297] + "..."
+
+    return {"code": code[:5], "data": data[:5], "si": si[:3], "data_availability": snippet}
+
+
+def scan_pdf(url: str, timeout: float = 20) -> dict:
+    """Download (or read) one PDF and extract its resource links. Runs inside pool workers."""
+    try:
+        if re.match(r"^[a-z][a-z0-9+.\-]*://", url, re.I):
+            req = urllib.request.Request(url, headers={"User-Agent": "paper-daily-bot/1.0"})
+            with urllib.request.urlopen(req, timeout=timeout) as r:
+                data = r.read(MAX_PDF_BYTES)
+        else:
+            data = Path(url).read_bytes()[:MAX_PDF_BYTES]
+        text, uris = pdf_text(data)
+        result = extract_links(text, uris)
+        result["pdf_url"] = url
+        return result
+    except Exception as e:
+        return {"pdf_url": url, "error": f"{type(e).__name__}: {e}"}
+
+
+def _load_cache(path: Path | None) -> dict:
+    if path is None or not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def scan_papers(papers: list[dict], budget: float = 25.0, workers: int = 4, cache_path: Path | None = None) -> dict:
+    """Attach ``p["fulltext"]`` to each paper that has a PDF, within ``budget`` seconds.
+
+    Cached entries are reused; papers not finished in time are simply left without
+    full-text results. Returns scan stats for the caller to log.
+    """
+    cache = _load_cache(cache_path)
+    todo: list[tuple[dict, str, str]] = []
+    stats = {"cached": 0, "scanned": 0, "failed": 0, "timed_out": 0}
+    for p in papers:
+        pid, url = paper_id(p), pdf_url_for(p)
+        if not url:
+            continue
+        if pid in cache:
+            p["fulltext"] = cache[pid]
+            stats["cached"] += 1
+        else:
+            todo.append((p, pid, url))
+
+    if todo and budget > 0:
+        deadline = time.monotonic() + budget
+        pool = multiprocessing.Pool(processes=max(1, min(workers, len(todo))))
+        try:
+            pending = [(p, pid, pool.apply_async(scan_pdf, (url, min(budget, 20)))) for p, pid, url in todo]
+            for p, pid, res in pending:
+                try:
+                    result = res.get(timeout=max(0.0, deadline - time.monotonic()))
+                except multiprocessing.TimeoutError:
+                    stats["timed_out"] += 1
+                    continue
+                if result.get("error"):
+                    stats["failed"] += 1
+                    continue
+                p["fulltext"] = result
+                cache[pid] = result
+                stats["scanned"] += 1
+        finally:
+            # Never wait on stragglers: the push must not exceed the budget.
+            pool.terminate()
+
+    if cache_path is not None and stats["scanned"]:
+        cache_path.write_text(json.dumps(cache, ensure_ascii=False, indent=2), encoding="utf-8")
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Extract code/data/SI links from PDF URLs or local PDF files")
+    parser.add_argument("pdfs", nargs="+", help="PDF URLs (http/https/file) or local paths")
+    parser.add_argument("--budget", type=float, default=25.0, help="Wall-clock budget in seconds")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--cache", default="", help="Optional JSON cache path")
+    args = parser.parse_args()
+
+    papers = [{"url": u, "pdf_url": u} for u in args.pdfs]
+    stats = scan_papers(papers, budget=args.budget, workers=args.workers, cache_path=Path(args.cache) if args.cache else None)
+    out = {p["pdf_url"]: p.get("fulltext") for p in papers}
+    print(json.dumps({"stats": stats, "results": out}, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""Offline replay of the push scoring over stored candidate pools, with weight tuning.
+
+Reads what run_today_push.py leaves in its --out-dir:
+- ``candidate-pool-YYYY-MM-DD[-category].jsonl``: every eligible candidate of a run
+- ``pushed-YYYY-MM-DD[-category].json``: what was pushed from that pool. Runs with
+  ``--allow-repeat`` write no pushed file, so their historical selection is unknown
+  and those pools are left out of the "Historical pushes" comparison.
+
+Scoring features are extracted once for the whole history and collapsed to the
+distinct feature vectors (a few thousand even for a year of pools). Each weight set
+is scored once per distinct vector via ``score_from_features`` (so replay and live
+scoring cannot drift) and broadcast back to all rows. No network access is needed.
+
+Optional labels JSON: ``{"liked": [url or title, ...], "disliked": [...]}``.
+
+Examples:
+    python3 replay_scoring.py --reports reports --labels labels.json
+    python3 replay_scoring.py --reports reports --weights cross_domain=15,venue_scale=0.5
+    python3 replay_scoring.py --reports reports --labels labels.json \\
+        --grid chem=0.25,0.35,0.45 --grid method=0.2,0.3,0.4 --grid min_score=18,22,26
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import itertools
+import json
+import multiprocessing
+import re
+from pathlib import Path
+
+from run_today_push import DEFAULT_KEYWORDS, DEFAULT_WEIGHTS, _load_category_keywords, score_features, score_from_features
+
+POOL_RE = re.compile(r"candidate-pool-(\d{4}-\d{2}-\d{2})(?:-(.+))?\.jsonl$")
+
+# Set in each grid-search worker by _init_worker.
+_TABLE: dict | None = None
+
+
+def _norm_title(title: str) -> str:
+    return re.sub(r"\W+", "", (title or "").lower())[:120]
+
+
+def _load_json_list(path: Path) -> list:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return data if isinstance(data, list) else []
+    except Exception:
+        return []
+
+
+def load_history(reports: Path, library: Path) -> dict:
+    """Build the flat feature table for every stored pool plus historical selections (None if unknown)."""
+    table: dict = {"groups": [], "spans": [], "features": [], "keys": [], "urls": [], "titles": [], "baseline": [], "skipped_lines": 0}
+    keyword_cache: dict[str, list[str]] = {}
+    feature_ids: dict[tuple, int] = {}
+
+    for pool_path in sorted(reports.glob("candidate-pool-*.jsonl")):
+        m = POOL_RE.search(pool_path.name)
+        if not m:
+            continue
+        date_str, category = m.group(1), m.group(2) or "all"
+        if category not in keyword_cache:
+            keyword_cache[category] = _load_category_keywords(category, library)
+
+        pushed_path = reports / f"pushed-{date_str}{'' if category == 'all' else '-' + category}.json"
+        pushed = {str(u) for u in _load_json_list(pushed_path)} if pushed_path.exists() else None
+
+        start = len(table["urls"])
+        baseline: set[int] | None = None if pushed is None else set()
+        with pool_path.open(encoding="utf-8") as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                try:
+                    p = json.loads(line)
+                except json.JSONDecodeError:
+                    p = None
+                if not isinstance(p, dict):
+                    # e.g. the last line of a pool whose push was killed mid-write
+                    table["skipped_lines"] += 1
+                    continue
+                idx = len(table["urls"])
+                if baseline is not None and p.get("url") and p["url"] in pushed:
+                    baseline.add(idx)
+                f = score_features(p, DEFAULT_KEYWORDS, keyword_cache[category])
+                fkey = tuple(f.items())
+                if fkey not in feature_ids:
+                    feature_ids[fkey] = len(table["features"])
+                    table["features"].append(f)
+                table["keys"].append(feature_ids[fkey])
+                table["urls"].append(p.get("url", ""))
+                table["titles"].append(p.get("title", ""))
+        table["groups"].append(f"{date_str} [{category}]")
+        table["spans"].append((start, len(table["urls"])))
+        table["baseline"].append(baseline)
+    return table
+
+
+def load_labels(path: Path | None) -> dict[str, set[str]]:
+    labels = {"liked": set(), "disliked": set()}
+    if path is None:
+        return labels
+    data = json.loads(path.read_text(encoding="utf-8"))
+    for kind in labels:
+        for item in data.get(kind, []):
+            item = str(item).strip()
+            labels[kind].update({item, _norm_title(item)} - {""})
+    return labels
+
+
+def label_rows(table: dict, labels: dict[str, set[str]]) -> list[int]:
+    """Per-row label: +1 liked, -1 disliked, 0 unlabeled."""
+    out = []
+    for url, title in zip(table["urls"], table["titles"]):
+        keys = {url, _norm_title(title)}
+        out.append(1 if keys & labels["liked"] else -1 if keys & labels["disliked"] else 0)
+    return out
+
+
+def select(table: dict, weights: dict, min_score: int, top_k: int) -> list[set[int]]:
+    """Re-rank every pool under ``weights``; returns selected row indices per pool."""
+    lut = [score_from_features(f, weights) for f in table["features"]]
+    scores = [lut[k] for k in table["keys"]]
+    chosen: list[set[int]] = []
+    for (start, end), base in zip(table["spans"], table["baseline"]):
+        # Ties keep pool order, matching the live ranking's stable sort.
+        best = heapq.nlargest(max(top_k, len(base or ())), range(start, end), key=lambda i: (scores[i], -i))
+        chosen.append({i for i in best if scores[i] >= min_score})
+    return chosen
+
+
+def evaluate(table: dict, chosen: list[set[int] | None], row_labels: list[int]) -> dict:
+    picked = [i for sel in chosen if sel for i in sel]
+    liked = sum(1 for i in picked if row_labels[i] > 0)
+    disliked = sum(1 for i in picked if row_labels[i] < 0)
+    return {
+        "selected": len(picked),
+        "liked": liked,
+        "disliked": disliked,
+        "precision": liked / (liked + disliked) if liked + disliked else None,
+        "changed_pools": sum(1 for sel, base in zip(chosen, table["baseline"]) if base is not None and sel != base),
+    }
+
+
+def _init_worker(table: dict, row_labels: list[int], top_k: int) -> None:
+    global _TABLE
+    _TABLE = {"table": table, "labels": row_labels, "top_k": top_k}
+
+
+def _evaluate_combo(combo: dict) -> tuple[dict, dict]:
+    assert _TABLE is not None
+    weights = {**DEFAULT_WEIGHTS, **{k: v for k, v in combo.items() if k != "min_score"}}
+    chosen = select(_TABLE["table"], weights, int(combo["min_score"]), _TABLE["top_k"])
+    return combo, evaluate(_TABLE["table"], chosen, _TABLE["labels"])
+
+
+def parse_assignments(items: list[str]) -> dict[str, list[float]]:
+    out: dict[str, list[float]] = {}
+    for item in items:
+        key, _, values = item.partition("=")
+        key = key.strip()
+        if key != "min_score" and key not in DEFAULT_WEIGHTS:
+            raise ValueError(f"Unknown weight '{key}'; choose from: min_score, {', '.join(DEFAULT_WEIGHTS)}")
+        out[key] = [float(v) for v in values.split(",") if v.strip()]
+        if not out[key]:
+            raise ValueError(f"No values given for '{key}'")
+    return out
+
+
+def _fmt_metrics(m: dict) -> str:
+    precision = "n/a" if m["precision"] is None else f"{m['precision']:.2f}"
+    return f"precision {precision} ({m['liked']} liked / {m['disliked']} disliked of {m['selected']} picks), {m['changed_pools']} pools differ from recorded pushes"
+
+
+def print_shifts(table: dict, reference: list[set[int]], chosen: list[set[int]], limit: int) -> None:
+    changed = sum(1 for s, b in zip(chosen, reference) if s != b)
+    print(f"  {changed} pools pick differently than under the current weights")
+    shown = 0
+    for g, (sel, base) in enumerate(zip(chosen, reference)):
+        if sel == base:
+            continue
+        if shown >= limit:
+            print(f"  ... {changed - limit} more")
+            return
+        print(f"  {table['groups'][g]}")
+        for i in sorted(base - sel):
+            print(f"    - {table['titles'][i][:100]}")
+        for i in sorted(sel - base):
+            print(f"    + {table['titles'][i][:100]}")
+        shown += 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay historical candidate pools under alternative scoring weights")
+    parser.add_argument("--reports", default="reports", help="Directory with candidate-pool-*.jsonl and pushed-*.json")
+    parser.add_argument("--library", default="skills/paper-daily-frontier/references/pdf-library-zhang-pchao.json")
+    parser.add_argument("--labels", default="", help='JSON file: {"liked": [...], "disliked": [...]} (URLs or titles)')
+    parser.add_argument("--top-k", type=int, default=1)
+    parser.add_argument("--min-score", type=int, default=22)
+    parser.add_argument("--weights", default="", help="One alternative weight set, e.g. 'chem=0.4,cross_domain=15'")
+    parser.add_argument("--grid", action="append", default=[], help="Grid axis 'name=v1,v2,...' (repeatable; needs --labels)")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--best", type=int, default=5, help="Grid results to print")
+    parser.add_argument("--show-shifts", type=int, default=10, help="Changed pools to list")
+    parser.add_argument("--json-out", default="", help="Optional path to write all metrics as JSON")
+    args = parser.parse_args()
+
+    try:
+        alt = {k: v[0] for k, v in parse_assignments(args.weights.split(",") if args.weights else []).items()}
+        grid = parse_assignments(args.grid)
+    except ValueError as e:
+        parser.error(str(e))
+    if grid and not args.labels:
+        parser.error("--grid needs --labels to have something to optimize")
+
+    table = load_history(Path(args.reports), Path(args.library))
+    if not table["groups"]:
+        print(f"[WARN] No candidate-pool-*.jsonl found under {args.reports}")
+        return
+    if table["skipped_lines"]:
+        print(f"[WARN] Skipped {table['skipped_lines']} unreadable pool lines")
+    row_labels = label_rows(table, load_labels(Path(args.labels) if args.labels else None))
+    print(f"[OK] Pools: {len(table['groups'])}, candidates: {len(table['urls'])}, labeled: {sum(1 for x in row_labels if x)}")
+
+    unknown = sum(1 for base in table["baseline"] if base is None)
+    if unknown:
+        print(f"[WARN] {unknown} pools have no pushed-*.json (e.g. --allow-repeat runs); their historical picks are unknown")
+    results: dict = {"baseline": evaluate(table, table["baseline"], row_labels)}
+    print(f"[OK] Historical pushes:  {_fmt_metrics(results['baseline'])}")
+    current = select(table, DEFAULT_WEIGHTS, args.min_score, args.top_k)
+    results["default"] = evaluate(table, current, row_labels)
+    print(f"[OK] Current weights:    {_fmt_metrics(results['default'])}")
+
+    if alt:
+        weights = {**DEFAULT_WEIGHTS, **{k: v for k, v in alt.items() if k != "min_score"}}
+        chosen = select(table, weights, int(alt.get("min_score", args.min_score)), args.top_k)
+        results["alternative"] = {"weights": alt, **evaluate(table, chosen, row_labels)}
+        print(f"[OK] Alternative {args.weights}: {_fmt_metrics(results['alternative'])}")
+        print_shifts(table, current, chosen, args.show_shifts)
+
+    if grid:
+        grid.setdefault("min_score", [args.min_score])
+        combos = [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+        with multiprocessing.Pool(max(1, args.workers), initializer=_init_worker, initargs=(table, row_labels, args.top_k)) as pool:
+            scored = pool.map(_evaluate_combo, combos, chunksize=max(1, len(combos) // (4 * max(1, args.workers))))
+        scored.sort(key=lambda r: (r[1]["precision"] or 0.0, r[1]["liked"], -r[1]["disliked"]), reverse=True)
+        results["grid"] = [{"weights": c, **m} for c, m in scored]
+        print(f"[OK] Grid search: {len(combos)} weight sets")
+        for c, m in scored[: args.best]:
+            print(f"  {', '.join(f'{k}={v:g}' for k, v in c.items())}: {_fmt_metrics(m)}")
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[OK] Metrics written: {args.json_out}")
+
+
+if __name__ == "__main__":
+    main()
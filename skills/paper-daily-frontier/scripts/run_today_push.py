@@ -5,11 +5,15 @@ import argparse
 import datetime as dt
 import json
 import re
+import urllib.error
 import urllib.parse
 import urllib.request
 import xml.etree.ElementTree as ET
 from pathlib import Path
 
+from fulltext_links import scan_papers
+from source_health import describe, load_history, source_policy
+
 ARXIV_API = "http://export.arxiv.org/api/query"
 CROSSREF_API = "https://api.crossref.org/works"
 OPENALEX_API = "https://api.openalex.org/authors"
@@ -100,16 +104,28 @@ VENUE_PRIORITY_BONUS = {
 }
 
 
+class SourceTimeout(Exception):
+    """Raised by a fetcher told to give up on a (degraded) source at its first timeout."""
+
+    def __init__(self, entries: list[dict]) -> None:
+        super().__init__("source timed out")
+        self.entries = entries
+
+
+def _is_timeout(e: Exception) -> bool:
+    return isinstance(e, TimeoutError) or (isinstance(e, urllib.error.URLError) and isinstance(e.reason, TimeoutError))
+
+
 def _fetch_json(url: str, timeout: int = 20) -> dict:
     req = urllib.request.Request(url, headers={"User-Agent": "paper-daily-bot/1.0"})
     with urllib.request.urlopen(req, timeout=timeout) as r:
         return json.loads(r.read().decode("utf-8", errors="ignore"))
 
 
-def fetch_arxiv(max_results: int = 80) -> list[dict]:
+def fetch_arxiv(max_results: int = 80, timeout: int = 20) -> list[dict]:
     query = f"search_query={urllib.parse.quote(CATEGORY_QUERY)}&sortBy=submittedDate&sortOrder=descending&max_results={max_results}"
     url = f"{ARXIV_API}?{query}"
-    with urllib.request.urlopen(url, timeout=20) as r:
+    with urllib.request.urlopen(url, timeout=timeout) as r:
         xml_data = r.read()
 
     ns = {"a": "http://www.w3.org/2005/Atom"}
@@ -120,10 +136,12 @@ def fetch_arxiv(max_results: int = 80) -> list[dict]:
         summary = (entry.findtext("a:summary", default="", namespaces=ns) or "").strip()
         published = (entry.findtext("a:published", default="", namespaces=ns) or "").strip()
         link = ""
+        pdf_link = ""
         for l in entry.findall("a:link", ns):
-            if l.get("type") == "text/html":
+            if l.get("type") == "text/html" and not link:
                 link = l.get("href", "")
-                break
+            elif l.get("title") == "pdf" and not pdf_link:
+                pdf_link = l.get("href", "")
         authors = [a.findtext("a:name", default="", namespaces=ns) for a in entry.findall("a:author", ns)]
         entries.append(
             {
@@ -131,6 +149,7 @@ def fetch_arxiv(max_results: int = 80) -> list[dict]:
                 "summary": re.sub(r"\s+", " ", summary),
                 "published": published[:10],
                 "url": link,
+                "pdf_url": pdf_link,
                 "authors": [x for x in authors if x],
                 "source": "arXiv",
                 "venue": "arXiv preprint",
@@ -139,7 +158,7 @@ def fetch_arxiv(max_results: int = 80) -> list[dict]:
     return entries
 
 
-def fetch_crossref_by_issn(days: int = 3, rows: int = 30) -> list[dict]:
+def fetch_crossref_by_issn(days: int = 3, rows: int = 30, timeout: int = 20, stop_on_timeout: bool = False) -> list[dict]:
     since = (dt.date.today() - dt.timedelta(days=days)).isoformat()
     all_entries: list[dict] = []
     for short, issn in JOURNALS.items():
@@ -152,8 +171,10 @@ def fetch_crossref_by_issn(days: int = 3, rows: int = 30) -> list[dict]:
         }
         url = f"{CROSSREF_API}?{urllib.parse.urlencode(params)}"
         try:
-            data = _fetch_json(url)
-        except Exception:
+            data = _fetch_json(url, timeout=timeout)
+        except Exception as e:
+            if stop_on_timeout and _is_timeout(e):
+                raise SourceTimeout(all_entries)
             continue
 
         items = data.get("message", {}).get("items", [])
@@ -190,7 +211,7 @@ def fetch_crossref_by_issn(days: int = 3, rows: int = 30) -> list[dict]:
     return all_entries
 
 
-def fetch_chemrxiv(days: int = 5, rows: int = 50) -> list[dict]:
+def fetch_chemrxiv(days: int = 5, rows: int = 50, timeout: int = 20, stop_on_timeout: bool = False) -> list[dict]:
     # Best-effort via Crossref query on ChemRxiv container-title.
     since = (dt.date.today() - dt.timedelta(days=days)).isoformat()
     params = {
@@ -199,12 +220,14 @@ def fetch_chemrxiv(days: int = 5, rows: int = 50) -> list[dict]:
         "sort": "published",
         "order": "desc",
         "rows": str(rows),
-        "select": "title,URL,DOI,author,published,container-title,abstract",
+        "select": "title,URL,DOI,author,published,container-title,abstract,link",
     }
     url = f"{CROSSREF_API}?{urllib.parse.urlencode(params)}"
     try:
-        data = _fetch_json(url)
-    except Exception:
+        data = _fetch_json(url, timeout=timeout)
+    except Exception as e:
+        if stop_on_timeout and _is_timeout(e):
+            raise SourceTimeout([])
         return []
 
     entries: list[dict] = []
@@ -228,12 +251,19 @@ def fetch_chemrxiv(days: int = 5, rows: int = 50) -> list[dict]:
             ymd = date_parts[0] + [1, 1]
             pdate = f"{ymd[0]:04d}-{ymd[1]:02d}-{ymd[2]:02d}"
 
+        pdf_link = ""
+        for l in it.get("link", []) or []:
+            if "pdf" in (l.get("content-type") or "").lower() or (l.get("URL") or "").lower().endswith(".pdf"):
+                pdf_link = l.get("URL", "")
+                break
+
         entries.append(
             {
                 "title": re.sub(r"\s+", " ", title).strip(),
                 "summary": summary,
                 "published": pdate,
                 "url": it.get("URL", ""),
+                "pdf_url": pdf_link,
                 "authors": authors,
                 "source": "ChemRxiv",
                 "venue": "ChemRxiv",
@@ -242,7 +272,7 @@ def fetch_chemrxiv(days: int = 5, rows: int = 50) -> list[dict]:
     return entries
 
 
-def fetch_crossref_by_titles(days: int = 3, rows: int = 20) -> list[dict]:
+def fetch_crossref_by_titles(days: int = 3, rows: int = 20, timeout: int = 20, stop_on_timeout: bool = False) -> list[dict]:
     since = (dt.date.today() - dt.timedelta(days=days)).isoformat()
     all_entries: list[dict] = []
     for title_name in JOURNAL_TITLES:
@@ -256,8 +286,10 @@ def fetch_crossref_by_titles(days: int = 3, rows: int = 20) -> list[dict]:
         }
         url = f"{CROSSREF_API}?{urllib.parse.urlencode(params)}"
         try:
-            data = _fetch_json(url)
-        except Exception:
+            data = _fetch_json(url, timeout=timeout)
+        except Exception as e:
+            if stop_on_timeout and _is_timeout(e):
+                raise SourceTimeout(all_entries)
             continue
 
         for it in data.get("message", {}).get("items", []):
@@ -296,7 +328,26 @@ def fetch_crossref_by_titles(days: int = 3, rows: int = 20) -> list[dict]:
     return all_entries
 
 
-def score_paper(p: dict, keywords: list[str], category_keywords: list[str] | None = None) -> tuple[int, int, int]:
+# Hand-tuned scoring constants; replay_scoring.py re-ranks stored candidate pools under alternatives.
+DEFAULT_WEIGHTS = {
+    "chem": 0.35,
+    "method": 0.30,
+    "evidence": 20,
+    "novelty": 10,
+    "repro": 5,
+    "anchor_multi": 18,
+    "anchor_single": 10,
+    "cross_domain": 25,
+    "venue_scale": 1.0,
+    "off_keyword_factor": 0.6,
+    "category_multi": 20,
+    "category_single": 10,
+    "off_category_factor": 0.75,
+}
+
+
+def score_features(p: dict, keywords: list[str], category_keywords: list[str] | None = None) -> dict:
+    """Weight-independent signals behind ``score_paper``."""
     text = (p.get("title", "") + " " + p.get("summary", "")).lower()
     method_kw = ["deep potential", "neural network potential", "machine learning potential", "enhanced sampling", "free energy", "neural ode", "wasserstein", "gradient flow", "nonlinear mobility"]
     chem_kw = ["proton transfer", "tautomerism", "hydronium", "hydroxide", "electrical double layer", "edl", "oxide-electrolyte", "marangoni", "bubble", "electrolysis", "hydrogen evolution", "interface", "electrolyte"]
@@ -311,45 +362,58 @@ def score_paper(p: dict, keywords: list[str], category_keywords: list[str] | Non
 
     method = sum(1 for k in method_kw if k in text)
     chem = sum(1 for k in chem_kw if k in text)
-    evidence = 1 if any(k in text for k in ["benchmark", "accuracy", "simulation", "experiment", "free energy", "validated"]) else 0
-    novelty = 1 if any(k in text for k in ["new", "novel", "first", "unprecedented"]) else 0
-    repro = 1 if any(k in text for k in ["code", "github", "open source", "dataset"]) else 0
-
-    matched_anchors = sum(1 for g in anchor_groups if any(k in text for k in g))
-
-    method_score = min(100, method * 12)
-    chem_score = min(100, chem * 9)
-    total = int(0.35 * chem_score + 0.30 * method_score + 20 * evidence + 10 * novelty + 5 * repro)
-
-    if matched_anchors >= 2:
-        total += 18
-    elif matched_anchors == 1:
-        total += 10
-
-    if any(k in text for k in ["electrochemical", "electrolyte", "interface"]) and any(k in text for k in ["neural ode", "ml potential", "deep potential", "gradient flow"]):
-        total += 25
 
     venue_text = f"{p.get('venue', '')} {p.get('source', '')}".lower()
     venue_bonus = 0
     for k, b in VENUE_PRIORITY_BONUS.items():
         if k in venue_text:
             venue_bonus = max(venue_bonus, b)
-    total += venue_bonus
 
-    if not any(k in text for k in keywords):
-        total = int(total * 0.6)
+    return {
+        "method_score": min(100, method * 12),
+        "chem_score": min(100, chem * 9),
+        "evidence": 1 if any(k in text for k in ["benchmark", "accuracy", "simulation", "experiment", "free energy", "validated"]) else 0,
+        "novelty": 1 if any(k in text for k in ["new", "novel", "first", "unprecedented"]) else 0,
+        "repro": 1 if any(k in text for k in ["code", "github", "open source", "dataset"]) else 0,
+        "anchors": sum(1 for g in anchor_groups if any(k in text for k in g)),
+        "cross_domain": 1 if any(k in text for k in ["electrochemical", "electrolyte", "interface"]) and any(k in text for k in ["neural ode", "ml potential", "deep potential", "gradient flow"]) else 0,
+        "venue_bonus": venue_bonus,
+        "keyword_hit": 1 if any(k in text for k in keywords) else 0,
+        # -1 means no category filter is active.
+        "category_hits": sum(1 for k in category_keywords if k.lower() in text) if category_keywords else -1,
+    }
+
+
+def score_from_features(f: dict, weights: dict = DEFAULT_WEIGHTS) -> int:
+    w = weights
+    total = int(w["chem"] * f["chem_score"] + w["method"] * f["method_score"] + w["evidence"] * f["evidence"] + w["novelty"] * f["novelty"] + w["repro"] * f["repro"])
+
+    if f["anchors"] >= 2:
+        total += w["anchor_multi"]
+    elif f["anchors"] == 1:
+        total += w["anchor_single"]
+
+    if f["cross_domain"]:
+        total += w["cross_domain"]
+
+    total += int(w["venue_scale"] * f["venue_bonus"])
+
+    if not f["keyword_hit"]:
+        total = int(total * w["off_keyword_factor"])
 
-    if category_keywords:
-        hit = sum(1 for k in category_keywords if k.lower() in text)
-        if hit >= 2:
-            total += 20
-        elif hit == 1:
-            total += 10
-        else:
-            total = int(total * 0.75)
+    if f["category_hits"] >= 2:
+        total += w["category_multi"]
+    elif f["category_hits"] == 1:
+        total += w["category_single"]
+    elif f["category_hits"] == 0:
+        total = int(total * w["off_category_factor"])
 
-    total = min(100, total)
-    return total, method_score, chem_score
+    return int(min(100, total))
+
+
+def score_paper(p: dict, keywords: list[str], category_keywords: list[str] | None = None) -> tuple[int, int, int]:
+    f = score_features(p, keywords, category_keywords)
+    return score_from_features(f), f["method_score"], f["chem_score"]
 
 
 def summarize(p: dict) -> str:
@@ -367,20 +431,29 @@ def extract_resource_links(p: dict) -> list[str]:
         u = u.rstrip('.,;')
         if u not in cleaned:
             cleaned.append(u)
-    useful = [u for u in cleaned if any(k in u.lower() for k in ["github.com", "gitlab", "bitbucket", "zenodo", "figshare", "dataset", "code"])]
-    return useful[:3]
+    useful = [u for u in cleaned if any(k in u.lower() for k in ["github.com", "gitlab", "bitbucket", "zenodo", "figshare", "dataset", "code"])][:3]
+
+    # Links found by the optional full-text PDF stage (see fulltext_links.py).
+    ft = p.get("fulltext") or {}
+    for u in ft.get("code", []) + ft.get("data", []) + ft.get("si", [])[:1]:
+        if u not in useful:
+            useful.append(u)
+    return useful[:6]
 
 
-def notable_author_line(authors: list[str]) -> str:
+def notable_author_line(authors: list[str], timeout: int | None = 20) -> str:
+    """OpenAlex-backed author note; ``timeout=None`` skips the lookup (OpenAlex known down)."""
     if not authors:
         return ""
+    if timeout is None:
+        return f"Notable author: {authors[-1]}."
 
     # Prefer the last author first (often senior/corresponding in this domain), then first author.
     candidates = [authors[-1], authors[0]] if len(authors) > 1 else [authors[0]]
     for name in candidates:
         try:
             url = f"{OPENALEX_API}?search={urllib.parse.quote(name)}&per-page=1"
-            data = _fetch_json(url)
+            data = _fetch_json(url, timeout=timeout)
             r = (data.get("results") or [{}])[0]
             matched = r.get("display_name") or name
             inst = ""
@@ -409,7 +482,13 @@ def dedupe(papers: list[dict]) -> list[dict]:
     return out
 
 
-def build_report(topic: str, papers: list[dict], date_str: str) -> str:
+def build_report(
+    topic: str,
+    papers: list[dict],
+    date_str: str,
+    source_notes: list[str] | None = None,
+    author_timeout: int | None = 20,
+) -> str:
     lines = [
         "# Daily Frontier Paper (English)",
         "",
@@ -419,8 +498,10 @@ def build_report(topic: str, papers: list[dict], date_str: str) -> str:
         "- Sources: arXiv + ChemRxiv + journal TOC (JCTC/JCIM/JACS/PRL/PNAS/CNS)",
         f"- Selection size: {len(papers)}",
         f"- Report date: {date_str}",
-        "",
     ]
+    for note in source_notes or []:
+        lines.append(f"- Source health: {note}")
+    lines.append("")
 
     if not papers:
         lines += [
@@ -432,7 +513,7 @@ def build_report(topic: str, papers: list[dict], date_str: str) -> str:
     p = papers[0]
     authors = p.get("authors", [])
     resources = extract_resource_links(p)
-    author_note = notable_author_line(authors)
+    author_note = notable_author_line(authors, timeout=author_timeout)
 
     lines += [
         "## 2) Paper of the Day",
@@ -455,10 +536,13 @@ def build_report(topic: str, papers: list[dict], date_str: str) -> str:
         f"- Chosen as the single most relevant paper by weighted score ({p.get('total_score', 0)}) and profile alignment.",
     ]
 
-    if resources:
+    availability = (p.get("fulltext") or {}).get("data_availability", "")
+    if resources or availability:
         lines += ["", "## 6) Code / resources"]
         for u in resources:
             lines.append(f"- {u}")
+        if availability:
+            lines.append(f"- Data availability (from full text): {availability}")
 
     return "\n".join(lines)
 
@@ -508,6 +592,21 @@ def _state_path(out_dir: Path, date_str: str, category: str = "all") -> Path:
     return out_dir / f"pushed-{date_str}{suffix}.json"
 
 
+def _pool_path(out_dir: Path, date_str: str, category: str = "all") -> Path:
+    suffix = "" if category in ("all", "auto", "") else f"-{category}"
+    return out_dir / f"candidate-pool-{date_str}{suffix}.jsonl"
+
+
+def _save_candidate_pool(out_dir: Path, date_str: str, pool: list[dict], category: str = "all") -> None:
+    """Persist every eligible candidate (pre-threshold) for offline replay_scoring.py runs."""
+    fields = ["title", "summary", "url", "authors", "published", "source", "venue"]
+    with _pool_path(out_dir, date_str, category).open("w", encoding="utf-8") as fh:
+        for p in pool:
+            rec = {k: p.get(k, "") for k in fields}
+            rec["category"] = category
+            fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+
 def _load_pushed_urls(out_dir: Path, date_str: str, category: str = "all") -> set[str]:
     p = _state_path(out_dir, date_str, category)
     if not p.exists():
@@ -536,6 +635,12 @@ def main() -> None:
     parser.add_argument("--library", default="skills/paper-daily-frontier/references/pdf-library-zhang-pchao.json")
     parser.add_argument("--min-score", type=int, default=22)
     parser.add_argument("--allow-repeat", action="store_true", help="Allow same-day repeats")
+    parser.add_argument("--health-history", default="", help="Source latency history from source_health.py (default: <out-dir>/source-health.json)")
+    parser.add_argument("--ignore-health", action="store_true", help="Fetch every source with default timeouts")
+    parser.add_argument("--fulltext-top-n", type=int, default=0, help="Scan PDFs of the top-N candidates for code/data links (0 = off)")
+    parser.add_argument("--fulltext-budget", type=float, default=25.0, help="Wall-clock seconds allowed for the full-text stage")
+    parser.add_argument("--fulltext-workers", type=int, default=4)
+    parser.add_argument("--fulltext-cache", default="", help="Full-text results cache (default: <out-dir>/fulltext-cache.json)")
     args = parser.parse_args()
 
     today = dt.datetime.utcnow().date()
@@ -543,25 +648,52 @@ def main() -> None:
 
     category_keywords = _load_category_keywords(args.category, Path(args.library))
 
+    health_path = Path(args.health_history) if args.health_history else Path(args.out_dir) / "source-health.json"
+    policy = {} if args.ignore_health else source_policy(load_history(health_path))
+    default_policy = {"status": "unknown", "timeout": 20}
+
+    fetchers = [
+        ("arxiv", lambda t, stop: fetch_arxiv(max_results=120, timeout=t)),
+        ("crossref", lambda t, stop: fetch_chemrxiv(days=args.days + 2, rows=60, timeout=t, stop_on_timeout=stop)),
+        ("crossref", lambda t, stop: fetch_crossref_by_issn(days=args.days + 2, rows=35, timeout=t, stop_on_timeout=stop)),
+        ("crossref", lambda t, stop: fetch_crossref_by_titles(days=args.days + 2, rows=20, timeout=t, stop_on_timeout=stop)),
+    ]
+    # Down sources are skipped outright; degraded ones are deferred to the end with a short
+    # timeout, and abandoned (all remaining queries) at their first timeout.
+    fetchers.sort(key=lambda f: policy.get(f[0], default_policy)["status"] == "degraded")
+
     papers = []
-    try:
-        papers.extend(fetch_arxiv(max_results=120))
-    except Exception:
-        pass
-    try:
-        papers.extend(fetch_chemrxiv(days=args.days + 2, rows=60))
-    except Exception:
-        pass
-    try:
-        papers.extend(fetch_crossref_by_issn(days=args.days + 2, rows=35))
-    except Exception:
-        pass
-    try:
-        papers.extend(fetch_crossref_by_titles(days=args.days + 2, rows=20))
-    except Exception:
-        pass
+    abandoned: set[str] = set()
+    for source, fetch in fetchers:
+        pol = policy.get(source, default_policy)
+        if pol["status"] == "down" or source in abandoned:
+            continue
+        degraded = pol["status"] == "degraded"
+        try:
+            papers.extend(fetch(pol["timeout"], degraded))
+        except SourceTimeout as e:
+            papers.extend(e.entries)
+            abandoned.add(source)
+        except Exception as e:
+            if degraded and _is_timeout(e):
+                abandoned.add(source)
+
+    source_notes = []
+    for source, pol in policy.items():
+        if pol["status"] == "down":
+            action = "author lookup skipped" if source == "openalex" else "skipped this run"
+            source_notes.append(f"{describe(source, pol)}; {action}.")
+        elif source in abandoned:
+            source_notes.append(f"{describe(source, pol)}; timed out this run, remaining queries skipped.")
+        elif pol["status"] == "degraded" and source == "openalex":
+            source_notes.append(f"{describe(source, pol)}; author lookup with {pol['timeout']} s timeout.")
+        elif pol["status"] == "degraded":
+            source_notes.append(f"{describe(source, pol)}; deferred with {pol['timeout']} s timeout.")
+    openalex = policy.get("openalex", default_policy)
+    author_timeout = None if openalex["status"] == "down" else openalex["timeout"]
 
     papers = dedupe(papers)
+    eligible: list[dict] = []
     ranked: list[dict] = []
     for p in papers:
         try:
@@ -575,6 +707,7 @@ def main() -> None:
             continue
         if category_keywords and not any(k.lower() in text for k in category_keywords):
             continue
+        eligible.append(p)
         total, method_score, chem_score = score_paper(p, DEFAULT_KEYWORDS, category_keywords)
         if total < args.min_score:
             continue
@@ -588,16 +721,22 @@ def main() -> None:
     date_str = dt.datetime.now().strftime("%Y-%m-%d")
     out_dir = Path(args.out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
+    _save_candidate_pool(out_dir, date_str, eligible, args.category)
 
     pushed_urls = set() if args.allow_repeat else _load_pushed_urls(out_dir, date_str, args.category)
     filtered = [p for p in ranked if (p.get("url") not in pushed_urls)]
+    # A top-N above top-k also warms the cache for same-day "再来一篇" follow-ups.
+    ft_stats = None
+    if args.fulltext_top_n > 0:
+        cache_path = Path(args.fulltext_cache) if args.fulltext_cache else out_dir / "fulltext-cache.json"
+        ft_stats = scan_papers(filtered[: args.fulltext_top_n], args.fulltext_budget, args.fulltext_workers, cache_path)
     top = filtered[: args.top_k]
 
     if top and not args.allow_repeat:
         pushed_urls.update(p.get("url", "") for p in top if p.get("url"))
         _save_pushed_urls(out_dir, date_str, pushed_urls, args.category)
 
-    report = build_report(args.topic, top, date_str)
+    report = build_report(args.topic, top, date_str, source_notes, author_timeout)
 
     md_path = out_dir / f"daily-report-{date_str}.md"
     json_path = out_dir / f"daily-report-{date_str}.json"
@@ -611,6 +750,10 @@ def main() -> None:
     print(f"[OK] Candidate pool: {len(papers)}")
     print(f"[OK] Already pushed today: {len(pushed_urls) - len(top) if (top and not args.allow_repeat) else len(pushed_urls)}")
     print(f"[OK] Selected papers: {len(top)}")
+    for note in source_notes:
+        print(f"[WARN] Source health: {note}")
+    if ft_stats is not None:
+        print(f"[OK] Full-text scan: {ft_stats['scanned']} scanned, {ft_stats['cached']} cached, {ft_stats['failed']} failed, {ft_stats['timed_out']} over budget")
 
 
 if __name__ == "__main__":
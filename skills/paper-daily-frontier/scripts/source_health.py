@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Probe upstream sources (arXiv, Crossref, OpenAlex) and keep a rolling latency history.
+
+run_today_push.py reads the same history via ``source_policy`` to pick per-source
+timeouts and to skip (down) or defer (degraded) sources before fetching.
+
+    python3 source_health.py --history reports/source-health.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import math
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Cheapest meaningful query per upstream; mirrors the endpoints used by run_today_push.py.
+PROBE_URLS = {
+    "arxiv": "http://export.arxiv.org/api/query?search_query=cat:physics.chem-ph&max_results=1",
+    "crossref": "https://api.crossref.org/works?rows=1&select=DOI",
+    "openalex": "https://api.openalex.org/authors?per-page=1",
+}
+
+MAX_SAMPLES_PER_SOURCE = 60
+POLICY_WINDOW = 20
+MAX_AGE_HOURS = 12
+DEFAULT_TIMEOUT = 20
+DEGRADED_TIMEOUT = 8
+MIN_TIMEOUT = 5
+PROBE_TIMEOUT = 10
+# Must stay well below PROBE_TIMEOUT: only successful probes have a latency to compare.
+SLOW_PROBE_MS = 5000
+
+
+def probe_once(source: str, url: str, timeout: float) -> dict:
+    start = time.monotonic()
+    sample = {"source": source, "ts": dt.datetime.utcnow().isoformat(timespec="seconds") + "Z", "ok": False, "error": ""}
+    try:
+        req = urllib.request.Request(url, headers={"User-Agent": "paper-daily-bot/1.0"})
+        with urllib.request.urlopen(req, timeout=timeout) as r:
+            r.read(4096)
+            sample["ok"] = 200 <= r.status < 400
+            if not sample["ok"]:
+                sample["error"] = f"HTTP {r.status}"
+    except Exception as e:
+        sample["error"] = f"{type(e).__name__}: {e}"[:200]
+    sample["latency_ms"] = round((time.monotonic() - start) * 1000, 1)
+    return sample
+
+
+def run_probes(sources: list[str], samples: int = 3, timeout: float = PROBE_TIMEOUT) -> list[dict]:
+    jobs = [(s, PROBE_URLS[s]) for s in sources for _ in range(samples)]
+    with ThreadPoolExecutor(max_workers=max(1, len(jobs))) as pool:
+        return list(pool.map(lambda job: probe_once(job[0], job[1], timeout), jobs))
+
+
+def load_history(path: Path) -> dict[str, list[dict]]:
+    """Read the history file, dropping anything that is not a list of sample objects."""
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {
+        str(source): [s for s in samples if isinstance(s, dict) and isinstance(s.get("latency_ms", 0), (int, float))]
+        for source, samples in data.items()
+        if isinstance(samples, list)
+    }
+
+
+def save_history(path: Path, history: dict[str, list[dict]], new_samples: list[dict]) -> None:
+    for s in new_samples:
+        history.setdefault(s["source"], []).append({k: v for k, v in s.items() if k != "source"})
+    for source in history:
+        history[source] = history[source][-MAX_SAMPLES_PER_SOURCE:]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(history, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def _parse_ts(ts: str) -> dt.datetime | None:
+    try:
+        return dt.datetime.fromisoformat(ts.rstrip("Z"))
+    except Exception:
+        return None
+
+
+def source_stats(samples: list[dict]) -> dict:
+    ok_lat = [float(s.get("latency_ms", 0)) for s in samples if s.get("ok")]
+    errors = sum(1 for s in samples if not s.get("ok"))
+    return {
+        "samples": len(samples),
+        "error_rate": errors / len(samples) if samples else 0.0,
+        "p50_ms": _percentile(ok_lat, 50),
+        "p95_ms": _percentile(ok_lat, 95),
+        "last_ok": bool(samples and samples[-1].get("ok")),
+    }
+
+
+def source_policy(history: dict[str, list[dict]], now: dt.datetime | None = None) -> dict[str, dict]:
+    """Classify each probed source; degraded sources get a shorter fetch timeout from recent latency.
+
+    Status is ``unknown`` (no recent probes; use defaults), ``healthy``,
+    ``degraded`` (fetch last, short timeout) or ``down`` (skip this run).
+    """
+    now = now or dt.datetime.utcnow()
+    policy: dict[str, dict] = {}
+    for source in PROBE_URLS:
+        recent = [
+            s for s in history.get(source, [])[-POLICY_WINDOW:]
+            if (t := _parse_ts(s.get("ts", ""))) is not None and now - t <= dt.timedelta(hours=MAX_AGE_HOURS)
+        ]
+        if not recent:
+            policy[source] = {"status": "unknown", "timeout": DEFAULT_TIMEOUT, "samples": 0}
+            continue
+
+        st = source_stats(recent)
+        if st["error_rate"] >= 0.6 and not st["last_ok"]:
+            status = "down"
+        elif st["error_rate"] >= 0.3 or st["p95_ms"] > SLOW_PROBE_MS:
+            status = "degraded"
+        else:
+            status = "healthy"
+
+        # Probes are tiny (1 row) while real fetches pull 100+ records, so probe latency only
+        # justifies shrinking the timeout for a degraded source; otherwise keep the 20 s default.
+        timeout = DEFAULT_TIMEOUT
+        if status == "degraded":
+            timeout = min(DEGRADED_TIMEOUT, max(MIN_TIMEOUT, math.ceil(3 * st["p95_ms"] / 1000)))
+        policy[source] = {"status": status, "timeout": timeout, **st}
+    return policy
+
+
+def describe(source: str, pol: dict) -> str:
+    if not pol.get("samples"):
+        return f"{source}: {pol['status']} (no recent probes)"
+    latency = f"p50 {pol['p50_ms']:.0f} ms, p95 {pol['p95_ms']:.0f} ms" if pol["p95_ms"] else "no successful probes"
+    return f"{source}: {pol['status']} ({latency}, errors {100 * pol['error_rate']:.0f}% over {pol['samples']} probes)"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Probe arXiv / Crossref / OpenAlex latency and update rolling history")
+    parser.add_argument("--history", default="reports/source-health.json")
+    parser.add_argument("--sources", default=",".join(PROBE_URLS), help="Comma-separated subset of: " + ", ".join(PROBE_URLS))
+    parser.add_argument("--samples", type=int, default=3, help="Requests per source in this run")
+    parser.add_argument("--timeout", type=float, default=PROBE_TIMEOUT)
+    args = parser.parse_args()
+
+    sources = [s.strip() for s in args.sources.split(",") if s.strip() in PROBE_URLS]
+    path = Path(args.history)
+    history = load_history(path)
+    save_history(path, history, run_probes(sources, args.samples, args.timeout))
+
+    for source, pol in source_policy(history).items():
+        if source in sources:
+            print(f"[{pol['status'].upper()}] {describe(source, pol)}; fetch timeout {pol['timeout']} s")
+    print(f"[OK] History updated: {path}")
+
+
+if __name__ == "__main__":
+    main()
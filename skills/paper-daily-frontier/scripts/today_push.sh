@@ -4,4 +4,8 @@ set -euo pipefail
 # Trigger command for: 今日推送
 # Generates English report + JSON under ./reports
 
+# Refresh upstream latency history first so the push can skip/defer known-bad sources.
+# Advisory only: a failed probe never blocks the push.
+python3 "$(dirname "$0")/source_health.py" --history "$(pwd)/reports/source-health.json" --samples 2 || true
+
 python3 "$(dirname "$0")/run_today_push.py" --top-k 1 --days 2 --out-dir "$(pwd)/reports" "$@"
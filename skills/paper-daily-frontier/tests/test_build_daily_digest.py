@@ -0,0 +1,57 @@
+"""Digest builder over mixed JSON-list and JSON Lines inputs."""
+
+from __future__ import annotations
+
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import build_daily_digest  # noqa: E402
+
+
+class BuildDailyDigestTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _write_inputs(self) -> None:
+        report = [{"title": "Solutal Marangoni flow in bubble detachment", "published": "2026-10-01", "url": "https://a"}]
+        (self.dir / "daily-report-2026-10-01.json").write_text(json.dumps(report), encoding="utf-8")
+        lines = [
+            {"title": "Solutal Marangoni effects at electrodes", "date": "2026-10-02", "url": "https://b"},
+            {"title": "Proton transfer in water", "url": "https://c"},
+        ]
+        (self.dir / "extra.jsonl").write_text("\n".join(json.dumps(x) for x in lines) + "\n\n", encoding="utf-8")
+
+    def test_mixed_json_list_and_jsonl(self) -> None:
+        self._write_inputs()
+        paths = build_daily_digest.expand_inputs([str(self.dir / "daily-report-*.json"), str(self.dir / "extra.jsonl")])
+        md, csv_out = io.StringIO(), io.StringIO()
+        n = build_daily_digest.render("t", "w", "s", build_daily_digest.iter_records(paths), md, csv_out)
+
+        self.assertEqual(n, 3)
+        text = md.getvalue()
+        self.assertIn("- Selection size: 3", text)
+        self.assertIn("- Published / Submitted: 2026-10-01", text)
+        self.assertIn("### Paper 3", text)
+        self.assertIn("solutal marangoni: appears in 2 of 3 papers (67%)", text)
+        self.assertEqual(len(csv_out.getvalue().strip().splitlines()), 4)
+
+    def test_non_paper_items_in_json_list_rejected(self) -> None:
+        self._write_inputs()
+        (self.dir / "pushed-2026-10-01.json").write_text(json.dumps(["https://a"]), encoding="utf-8")
+        paths = build_daily_digest.expand_inputs([str(self.dir / "*.json")])
+        with self.assertRaisesRegex(ValueError, r"pushed-2026-10-01\.json: item 0 is not a paper object"):
+            list(build_daily_digest.iter_records(paths))
+
+
+if __name__ == "__main__":
+    unittest.main()
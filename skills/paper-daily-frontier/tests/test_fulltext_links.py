@@ -0,0 +1,108 @@
+"""Full-text link extraction against sample PDFs served from a local HTTP server.
+
+Run with: python3 -m unittest discover -s skills/paper-daily-frontier/tests
+"""
+
+from __future__ import annotations
+
+import functools
+import http.server
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+FIXTURES = Path(__file__).parent / "fixtures"
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import fulltext_links  # noqa: E402
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args) -> None:
+        pass
+
+
+class SlowHandler(http.server.BaseHTTPRequestHandler):
+    """Never answers within the test budget."""
+
+    def do_GET(self) -> None:
+        time.sleep(10)
+        self.send_response(200)
+        self.end_headers()
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class FulltextLinksTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        handler = functools.partial(QuietHandler, directory=str(FIXTURES))
+        cls.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_scan_papers_from_local_server(self) -> None:
+        papers = [
+            {"url": f"{self.base}/latex-hyperref-sample.pdf"},
+            {"url": f"{self.base}/word-hex-sample.pdf"},
+        ]
+        stats = fulltext_links.scan_papers(papers, budget=5, workers=2)
+        self.assertEqual(stats["scanned"], 2, stats)
+
+        latex, word = papers[0]["fulltext"], papers[1]["fulltext"]
+        self.assertIn("https://github.com/example/annotated-repo", latex["code"])
+        self.assertIn("https://github.com/example/dp-edl", latex["code"])
+        self.assertIn("https://doi.org/10.5281/zenodo.1234567", latex["data"])
+        self.assertTrue(latex["data_availability"].startswith("Data and code availability"))
+
+        self.assertIn("https://figshare.com/articles/dataset/987654", word["data"])
+        self.assertIn("https://gitlab.com/example/bubble-her", word["code"])
+        self.assertTrue(word["data_availability"].startswith("Data Availability Statement"))
+
+    def test_cache_reused_without_download(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = Path(tmp) / "cache.json"
+            url = f"{self.base}/latex-hyperref-sample.pdf"
+            fulltext_links.scan_papers([{"url": url}], budget=5, workers=1, cache_path=cache)
+            stats = fulltext_links.scan_papers([{"url": url}], budget=5, workers=1, cache_path=cache)
+            self.assertEqual(stats["cached"], 1)
+            self.assertEqual(stats["scanned"], 0)
+
+    def test_slow_server_does_not_exceed_budget(self) -> None:
+        slow = http.server.ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+        threading.Thread(target=slow.serve_forever, daemon=True).start()
+        try:
+            papers = [
+                {"url": f"http://127.0.0.1:{slow.server_address[1]}/stalled.pdf"},
+                {"url": f"{self.base}/word-hex-sample.pdf"},
+            ]
+            start = time.monotonic()
+            stats = fulltext_links.scan_papers(papers, budget=2, workers=2)
+            elapsed = time.monotonic() - start
+        finally:
+            slow.shutdown()
+            slow.server_close()
+
+        self.assertLess(elapsed, 2 + 1.0)
+        self.assertEqual(stats["timed_out"], 1, stats)
+        self.assertEqual(stats["scanned"], 1, stats)
+        self.assertNotIn("fulltext", papers[0])
+
+    def test_names_tree_array_does_not_backtrack(self) -> None:
+        names = b"[" + b" ".join(b"(section.%d) %d 0 R" % (i, i) for i in range(200)) + b"]"
+        start = time.monotonic()
+        self.assertEqual(fulltext_links._content_text(names).strip(), "")
+        self.assertLess(time.monotonic() - start, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
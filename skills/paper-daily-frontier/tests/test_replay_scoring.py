@@ -0,0 +1,53 @@
+"""Replay input handling: weight assignments and damaged candidate pools."""
+
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import replay_scoring  # noqa: E402
+
+
+class ReplayScoringTest(unittest.TestCase):
+    def test_parse_assignments(self) -> None:
+        self.assertEqual(replay_scoring.parse_assignments(["chem=0.3,0.4", "min_score=20"]), {"chem": [0.3, 0.4], "min_score": [20.0]})
+        with self.assertRaisesRegex(ValueError, "No values given for 'chem'"):
+            replay_scoring.parse_assignments(["chem"])
+        with self.assertRaisesRegex(ValueError, "Unknown weight"):
+            replay_scoring.parse_assignments(["chemistry=0.3"])
+
+    def test_truncated_pool_lines_are_skipped(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            reports = Path(tmp)
+            good = {"url": "https://example.org/a", "title": "Deep potential electrolyte interface"}
+            (reports / "candidate-pool-2026-10-18.jsonl").write_text(
+                json.dumps(good) + '\n[1]\n{"url": "https://example.org/b", "ti', encoding="utf-8"
+            )
+            table = replay_scoring.load_history(reports, reports / "missing-library.json")
+        self.assertEqual(table["urls"], ["https://example.org/a"])
+        self.assertEqual(table["skipped_lines"], 2)
+
+    def test_baseline_only_from_pushed_files(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            reports = Path(tmp)
+            paper = {"url": "https://example.org/a", "title": "Deep potential electrolyte interface"}
+            for date_str in ("2026-10-17", "2026-10-18"):
+                (reports / f"candidate-pool-{date_str}.jsonl").write_text(json.dumps(paper) + "\n", encoding="utf-8")
+                # Overwritten by every run that day, so it must not be read as the pool's selection.
+                (reports / f"daily-report-{date_str}.json").write_text(json.dumps([paper]), encoding="utf-8")
+            (reports / "pushed-2026-10-17.json").write_text(json.dumps([paper["url"]]), encoding="utf-8")
+            table = replay_scoring.load_history(reports, reports / "missing-library.json")
+
+        self.assertEqual(table["baseline"], [{0}, None])
+        metrics = replay_scoring.evaluate(table, [set(), {1}], [0, 0])
+        self.assertEqual(metrics["changed_pools"], 1)
+        self.assertEqual(metrics["selected"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
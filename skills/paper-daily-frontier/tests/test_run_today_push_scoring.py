@@ -0,0 +1,44 @@
+"""Pinned live-ranking scores, so weight edits (or replay_scoring refactors) cannot drift silently."""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from run_today_push import DEFAULT_KEYWORDS, score_paper  # noqa: E402
+
+EDL_PAPER = {
+    "title": "Deep potential study of the electrolyte interface",
+    "summary": "Proton transfer at the electrical double layer from simulation.",
+    "venue": "JACS",
+}
+
+
+class ScorePaperTest(unittest.TestCase):
+    def test_multiple_anchor_groups(self) -> None:
+        p = {
+            "title": "Neural ODE gradient flow for slow mode discovery",
+            "summary": "A novel Wasserstein method with benchmark accuracy and open source code.",
+            "venue": "arXiv",
+        }
+        self.assertEqual(score_paper(p, DEFAULT_KEYWORDS), (63, 36, 0))
+
+    def test_cross_domain_bonus(self) -> None:
+        self.assertEqual(score_paper(EDL_PAPER, DEFAULT_KEYWORDS), (81, 12, 36))
+
+    def test_off_keyword_penalty(self) -> None:
+        p = {"title": "Bubble electrolysis experiment", "summary": "Gas release at a porous interface.", "venue": "Joule"}
+        self.assertEqual(score_paper(p, DEFAULT_KEYWORDS), (22, 0, 27))
+
+    def test_category_hit_bonus(self) -> None:
+        self.assertEqual(score_paper(EDL_PAPER, DEFAULT_KEYWORDS, ["double layer"]), (91, 12, 36))
+
+    def test_off_category_penalty(self) -> None:
+        self.assertEqual(score_paper(EDL_PAPER, DEFAULT_KEYWORDS, ["marangoni"]), (60, 12, 36))
+
+
+if __name__ == "__main__":
+    unittest.main()
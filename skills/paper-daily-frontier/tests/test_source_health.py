@@ -0,0 +1,76 @@
+"""Source classification and timeout policy from a fixed-time probe history."""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+import source_health  # noqa: E402
+
+NOW = dt.datetime(2026, 10, 19, 12, 0, 0)
+
+
+def sample(ok: bool, latency_ms: float = 400, hours_ago: float = 1) -> dict:
+    ts = (NOW - dt.timedelta(hours=hours_ago)).isoformat(timespec="seconds") + "Z"
+    return {"ts": ts, "ok": ok, "latency_ms": latency_ms, "error": "" if ok else "TimeoutError: timed out"}
+
+
+class SourcePolicyTest(unittest.TestCase):
+    def policy(self, samples: list[dict]) -> dict:
+        return source_health.source_policy({"arxiv": samples}, now=NOW)["arxiv"]
+
+    def test_healthy_keeps_default_timeout(self) -> None:
+        pol = self.policy([sample(True, 350), sample(True, 400), sample(True, 380)])
+        self.assertEqual(pol["status"], "healthy")
+        self.assertEqual(pol["timeout"], source_health.DEFAULT_TIMEOUT)
+        self.assertEqual(pol["p95_ms"], 400)
+
+    def test_down_when_mostly_failing_and_last_failed(self) -> None:
+        pol = self.policy([sample(True), sample(False), sample(False), sample(False)])
+        self.assertEqual(pol["status"], "down")
+        self.assertEqual(
+            source_health.describe("arxiv", pol),
+            "arxiv: down (p50 400 ms, p95 400 ms, errors 75% over 4 probes)",
+        )
+
+    def test_mostly_failing_but_recovered_is_degraded(self) -> None:
+        pol = self.policy([sample(False), sample(False), sample(False), sample(True, 1000)])
+        self.assertEqual(pol["status"], "degraded")
+
+    def test_degraded_by_error_rate_gets_short_timeout(self) -> None:
+        pol = self.policy([sample(True, 2000), sample(False), sample(True, 2000)])
+        self.assertEqual(pol["status"], "degraded")
+        self.assertEqual(pol["timeout"], 6)
+
+    def test_degraded_by_slow_p95(self) -> None:
+        pol = self.policy([sample(True, 9999)] * 5)
+        self.assertEqual(pol["status"], "degraded")
+        self.assertEqual(pol["timeout"], source_health.DEGRADED_TIMEOUT)
+
+    def test_stale_samples_are_unknown(self) -> None:
+        pol = self.policy([sample(False, hours_ago=source_health.MAX_AGE_HOURS + 1)] * 5)
+        self.assertEqual(pol["status"], "unknown")
+        self.assertEqual(pol["timeout"], source_health.DEFAULT_TIMEOUT)
+        self.assertEqual(source_health.describe("arxiv", pol), "arxiv: unknown (no recent probes)")
+
+    def test_all_failures_described_without_latency(self) -> None:
+        pol = self.policy([sample(False)] * 3)
+        self.assertEqual(source_health.describe("arxiv", pol), "arxiv: down (no successful probes, errors 100% over 3 probes)")
+
+    def test_malformed_history_is_ignored(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "source-health.json"
+            path.write_text(json.dumps({"arxiv": "garbage", "crossref": [None, "x", sample(True)], "openalex": None}))
+            history = source_health.load_history(path)
+        self.assertEqual(list(history), ["crossref"])
+        self.assertEqual(source_health.source_policy(history, now=NOW)["crossref"]["status"], "healthy")
+
+
+if __name__ == "__main__":
+    unittest.main()